@@ -3,7 +3,10 @@
 # state_controller = StateController()
 # state_controller.control_loop()
 
+import logging
 from __old_state_controller import StateController
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 state_controller = StateController()
 state_controller.control_loop()
\ No newline at end of file
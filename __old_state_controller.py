@@ -1,65 +1,110 @@
 import time
+import logging
 from networking.broadcast_controller import BroadcastHandler
-from networking.drone_packet import DronePacket
+from networking.drone_packet import DronePacket, should_process
 import random
 
+# Verbose protocol tracing goes through logging so it costs nothing unless
+# a handler is configured at DEBUG level
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# The coarse monotonic clock is a cheap vDSO read on Linux and is precise
+# enough for the multi-second timeouts used here
+if hasattr(time, "CLOCK_MONOTONIC_COARSE"):
+    def _now():
+        return time.clock_gettime(time.CLOCK_MONOTONIC_COARSE)
+else:
+    _now = time.monotonic
+
 class StateController:
     def __init__(self):
         # self.states = ["SEEKING", "CONNECTED", "MASTER", "SLAVE"]
         self.current_state = "SEEKING"
-        self.boot_time = time.monotonic()
-        self.last_ping_time = time.monotonic()
+        self.boot_time = _now()
+        self.last_ping_time = self.boot_time
         self.drone_id = 0
         self.destination_id = -1  # -1 means broadcast to all
-        self.detected_drones = []  # Start with ID 0 detected
-        self.acked_drones = []
+        self.detected_drones = {self.drone_id}  # Start with ID 0 detected
+        self.acked_drones = {self.drone_id}
+        self._max_drone_id = self.drone_id  # Highest ID in detected_drones since its last reset
         self.detected_drones_to_check = []
         self.bh = BroadcastHandler()
+        self._pkt = DronePacket()  # Reused for every send; each call sets all fields
+        # (current_state, action) -> handler; a None state matches any state
+        self._dispatch = {
+            ("SEEKING", "PING"): self._on_seeking_ping,
+            ("CONNECTED", "PING"): self._on_connected_ping,
+            ("MASTER", "PING"): self._on_master_ping,
+            ("MASTER", "ACK"): self._on_master_ack,
+            ("SLAVE", "UPDATE"): self._on_slave_update,
+            (None, "SET_SLAVE"): self._on_set_slave,
+            (None, "SET_ID"): self._on_set_id,
+        }
         self.time_step = 3  # Time step in seconds
         # self.random_offset = random.uniform(-1, 1)  # Random offset between -1 and 1 seconds
     
     def switch_states(self, new_state):
-        print(f"Switching state from {self.current_state} to {new_state} : Drone ID {self.drone_id}")
+        log.info("Switching state from %s to %s : Drone ID %s", self.current_state, new_state, self.drone_id)
         self.current_state = new_state
         
+    def schedule_next_send(self, now):
+        # Jitter is sampled once per send rather than on every loop pass
+        self._next_send_deadline = now + self.time_step * (1 + random.uniform(-0.02, 0.02))
+        
     def control_loop(self):
-        pack_sent_time = time.monotonic()
-        display_time = time.monotonic()
+        current_time = _now()
+        pack_sent_time = current_time
+        display_time = current_time
         connected_tries = 0
-        print("Starting control loop...")
+        self.schedule_next_send(current_time)
+        log.info("Starting control loop...")
         while True:
-            current_time = time.monotonic()
-            self.process_incoming()
+            # Block until a packet arrives or the next send/timeout is due
+            # instead of spinning on get_packet()
+            if self.current_state == "SLAVE":
+                deadline = self.last_ping_time + 3 * self.time_step  # Slaves only wait on the master
+            else:
+                deadline = self._next_send_deadline
+            packet_ready = self.bh.wait_for_packet(max(0, deadline - current_time))
+            # One clock read per iteration, shared by every branch below
+            current_time = _now()
+            if packet_ready:
+                self.process_incoming(current_time)
             if (self.current_state in ["SEEKING", "CONNECTED"]) and \
-                (current_time - pack_sent_time) > (1  + random.uniform(-0.02, 0.02)) * self.time_step:
-                DronePacket().ping(self.bh, drone_id=self.drone_id, destination_id=self.destination_id, current_state=self.current_state)
-                pack_sent_time = time.monotonic()
-                print(f"{pack_sent_time} Sending ping from drone {self.drone_id} to {"ALL" if self.destination_id == -1 else self.destination_id}")
-                print(f"Current detected drones: {self.detected_drones}")
-                print(f"Current drone ID: {self.drone_id}")
-                print(f"Current state: {self.current_state}")
+                current_time >= self._next_send_deadline:
+                self._pkt.ping(self.bh, drone_id=self.drone_id, destination_id=self.destination_id, current_state=self.current_state)
+                pack_sent_time = current_time
+                self.schedule_next_send(current_time)
+                log.debug("%s Sending ping from drone %s to %s", pack_sent_time, self.drone_id, "ALL" if self.destination_id == -1 else self.destination_id)
+                log.debug("Current detected drones: %s", self.detected_drones)
+                log.debug("Current drone ID: %s", self.drone_id)
+                log.debug("Current state: %s", self.current_state)
                 if self.current_state == "CONNECTED":
                     connected_tries += 1
                     if connected_tries > 5:
-                        print("No response after 5 tries, resetting to SEEKING state")
+                        log.debug("No response after 5 tries, resetting to SEEKING state")
                         self.switch_states("SEEKING")
-                        self.detected_drones = [self.drone_id]  # Reset detected drones to only include self
+                        self.detected_drones = {self.drone_id}  # Reset detected drones to only include self
+                        self._max_drone_id = self.drone_id
                         self.destination_id = -1  # Reset to broadcast
                         connected_tries = 0
-            elif self.current_state == "MASTER" and (current_time - pack_sent_time) > (1  + random.uniform(-0.02, 0.02)) * self.time_step:
-                self.detected_drones = self.acked_drones.copy()
-                self.acked_drones = [self.drone_id]  # Clear acked drones list before sending update
-                DronePacket().update(self.bh, drone_id=self.drone_id, destination_id=-1, current_state=self.current_state, update_info={"detected_drones": self.detected_drones})
-                pack_sent_time = time.monotonic()
-                print(f"{pack_sent_time} Sending update from MASTER drone {self.drone_id} to ALL")
+            elif self.current_state == "MASTER" and current_time >= self._next_send_deadline:
+                # Hand the acked set over to detected and start a fresh one, no copy needed
+                self.detected_drones, self.acked_drones = self.acked_drones, {self.drone_id}
+                self._pkt.update(self.bh, drone_id=self.drone_id, destination_id=-1, current_state=self.current_state, update_info={"detected_drones": sorted(self.detected_drones)})
+                pack_sent_time = current_time
+                self.schedule_next_send(current_time)
+                log.debug("%s Sending update from MASTER drone %s to ALL", pack_sent_time, self.drone_id)
             if self.current_state == "SLAVE" and (current_time - self.last_ping_time > 3 * self.time_step):
-                print("No response for 0.5 seconds, resetting to SEEKING state")
+                log.debug("No response for 0.5 seconds, resetting to SEEKING state")
                 self.switch_states("SEEKING")
-                self.detected_drones = [self.drone_id]  # Reset detected drones to only include self
+                self.detected_drones = {self.drone_id}  # Reset detected drones to only include self
+                self._max_drone_id = self.drone_id
                 self.destination_id = -1  # Reset to broadcast
                 # Optionally, you could also reset the drone_id here if desired
                 # self.drone_id = 0
-                self.last_ping_time = time.monotonic()
+                self.last_ping_time = current_time
             # if current_time - display_time > 2:
             #     display_time = time.monotonic()
             #     print("----- Status Update -----")
@@ -70,94 +115,112 @@ class StateController:
             #     self.last_ping_time = time.monotonic()
             #     print("No response resetting to SEEKING state")
             #     self.current_state = "SEEKING"
-            #     self.detected_drones = [self.drone_id]  # Reset detected drones to only include self
+            #     self.detected_drones = {self.drone_id}  # Reset detected drones to only include self
             #     # Optionally, you could also reset the drone_id here if desired
             #     # self.drone_id = 0
                 
                     
-    def process_incoming(self):
+    def process_incoming(self, now=None):
         packet_info = self.bh.get_packet()
         last_state = self.current_state
         if packet_info:
             rcv_time, data, packet = packet_info
             try:
-                other = DronePacket(data.decode('utf-8'))
+                # Skip the JSON parse entirely for packets addressed to other drones
+                if not should_process(data, self.drone_id):
+                    return
+                other = DronePacket(data)
                 if other.destination_id == -1 or other.destination_id == self.drone_id:
-                    self.last_ping_time = time.monotonic()
+                    self.last_ping_time = now if now is not None else _now()
                     # print(f"Received packet from drone {drone_packet.drone_id} with action {drone_packet.request_action}")
-                    # Process the packet based on its action and current state
-                    if self.current_state == "SEEKING" and other.request_action == "PING":
-                        if self.drone_id == other.drone_id:
-                            print(f"Collision detected for drone ID: {self.drone_id}")
-                            self.drone_id = other.drone_id + 1
-                            print(f"New drone ID assigned: {self.drone_id}")
-                        self.detected_drones.append(other.drone_id)
-                        self.detected_drones.append(self.drone_id)
-                        self.detected_drones = list(set(self.detected_drones))  # Remove duplicates
-                        self.destination_id = other.drone_id  # Reply directly to the sender
-                        self.switch_states("CONNECTED")
-                    elif self.current_state == "CONNECTED" and other.current_state == "CONNECTED" and other.request_action == "PING":
-                        print(f"Both drones in CONNECTED state!")
-                        if self.drone_id == other.destination_id and self.drone_id < other.drone_id:
-                            self.switch_states("MASTER")
-                            # print(f"Transitioning to MASTER state with drone ID: {self.drone_id}")
-                            print(f"Sending SET_SLAVE to drone ID: {other.drone_id}")
-                            DronePacket().set_slave(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state)
-                    elif other.request_action == "SET_SLAVE" and other.current_state == "MASTER" and other.destination_id == self.drone_id:
-                        self.switch_states("SLAVE")
-                        self.destination_id = other.drone_id  # Set destination to MASTER
-                        print(f"Transitioning to SLAVE state from with drone ID: {self.drone_id}")
-                        print(f"Updated detected drones: {self.detected_drones}")
-                    elif other.request_action == "PING" and self.current_state == "MASTER":
-                        print(f"Received PING from drone ID: {other.drone_id}")
-                        if other.drone_id not in self.detected_drones:
-                            self.detected_drones.append(other.drone_id)
-                            self.detected_drones = list(set(self.detected_drones))  # Remove duplicates
-                            print(f"Updated detected drones: {self.detected_drones}")
-                            new_id = other.drone_id
-                            print(f"Assigning existing ID {new_id} to drone ID: {other.drone_id}")
-                            DronePacket().set_slave(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state)
-                        else:
-                            print(f"Drone ID: {other.drone_id} already in detected drones.")
-                            max_id = max(self.detected_drones)
-                            new_id = max_id + 1
-                            print(f"Assigning new ID {new_id} to drone ID: {other.drone_id}")
-                            self.detected_drones.append(new_id)
-                            self.detected_drones = list(set(self.detected_drones))  # Remove duplicates
-                            print(f"Updated detected drones: {self.detected_drones}")
-                            DronePacket().set_id(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state, new_id=new_id)
-                    elif other.request_action == "SET_ID" and other.destination_id == self.drone_id:
-                        new_id = other.params.get("new_id", None)
-                        if new_id is not None:
-                            print(f"Changing drone ID from {self.drone_id} to {new_id}")
-                            self.drone_id = new_id
-                            if self.current_state != "MASTER":
-                                self.switch_states("SLAVE")
-                                self.destination_id = other.drone_id  # Reply directly to the sender
-                                self.detected_drones = [self.drone_id]  # Reset detected drones to only include self
-                                print(f"New drone ID: {self.drone_id}")
-                                print(f"Updated detected drones: {self.detected_drones}")
-                        # DronePacket().ping(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state)
-                    elif other.request_action == "UPDATE" and self.current_state == "SLAVE":
-                        update_info = other.params
-                        new_drones = update_info.get("detected_drones", [])
-                        self.detected_drones = new_drones
-                        self.detected_drones = list(set(self.detected_drones))  # Remove duplicates
-                        print(f"Received UPDATE from MASTER. Updated detected drones: {self.detected_drones}")
-                        print(f"Current drone ID: {self.drone_id}")
-                        DronePacket().ack(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state, ack_info={"status": "UPDATE_RECEIVED"})
-                    elif other.request_action == "ACK" and self.current_state == "MASTER":
-                        print(f"Received ACK from drone ID: {other.drone_id} with info: {other.params}")
-                        status = other.params.get("status", "")
-                        if status == "UPDATE_RECEIVED":
-                            print(f"Slave drone ID: {other.drone_id} acknowledged the update.")
-                            self.acked_drones.append(other.drone_id)
-                            self.acked_drones = list(set(self.acked_drones))  # Remove duplicates
-                            print(f"Current acked drones: {self.acked_drones}")
-                            print(f"Current drone ID: {self.drone_id}")
-                            
-                            
-
-                        
+                    # Process the packet based on its action and current state,
+                    # falling back to handlers that apply in any state
+                    handler = self._dispatch.get((self.current_state, other.request_action)) or \
+                        self._dispatch.get((None, other.request_action))
+                    if handler:
+                        handler(other)
             except Exception as e:
-                print(f"Error processing incoming packet: {e}")
\ No newline at end of file
+                log.warning("Error processing incoming packet: %s", e)
+
+    def _on_seeking_ping(self, other):
+        if self.drone_id == other.drone_id:
+            log.debug("Collision detected for drone ID: %s", self.drone_id)
+            self.drone_id = other.drone_id + 1
+            log.debug("New drone ID assigned: %s", self.drone_id)
+        self.detected_drones.add(other.drone_id)
+        self.detected_drones.add(self.drone_id)
+        self._max_drone_id = max(self._max_drone_id, other.drone_id, self.drone_id)
+        self.destination_id = other.drone_id  # Reply directly to the sender
+        self.switch_states("CONNECTED")
+
+    def _on_connected_ping(self, other):
+        if other.current_state != "CONNECTED":
+            return
+        log.debug("Both drones in CONNECTED state!")
+        if self.drone_id == other.destination_id and self.drone_id < other.drone_id:
+            self.switch_states("MASTER")
+            # print(f"Transitioning to MASTER state with drone ID: {self.drone_id}")
+            log.debug("Sending SET_SLAVE to drone ID: %s", other.drone_id)
+            self._pkt.set_slave(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state)
+
+    def _on_set_slave(self, other):
+        if other.current_state != "MASTER" or other.destination_id != self.drone_id:
+            return
+        self.switch_states("SLAVE")
+        self.destination_id = other.drone_id  # Set destination to MASTER
+        log.debug("Transitioning to SLAVE state from with drone ID: %s", self.drone_id)
+        log.debug("Updated detected drones: %s", self.detected_drones)
+
+    def _on_master_ping(self, other):
+        log.debug("Received PING from drone ID: %s", other.drone_id)
+        if other.drone_id not in self.detected_drones:
+            self.detected_drones.add(other.drone_id)
+            self._max_drone_id = max(self._max_drone_id, other.drone_id)
+            log.debug("Updated detected drones: %s", self.detected_drones)
+            new_id = other.drone_id
+            log.debug("Assigning existing ID %s to drone ID: %s", new_id, other.drone_id)
+            self._pkt.set_slave(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state)
+        else:
+            log.debug("Drone ID: %s already in detected drones.", other.drone_id)
+            # Running maximum instead of a max() scan over detected_drones
+            new_id = self._max_drone_id + 1
+            self._max_drone_id = new_id
+            log.debug("Assigning new ID %s to drone ID: %s", new_id, other.drone_id)
+            self.detected_drones.add(new_id)
+            log.debug("Updated detected drones: %s", self.detected_drones)
+            self._pkt.set_id(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state, new_id=new_id)
+
+    def _on_set_id(self, other):
+        if other.destination_id != self.drone_id:
+            return
+        new_id = other.params.get("new_id", None)
+        if new_id is not None:
+            log.debug("Changing drone ID from %s to %s", self.drone_id, new_id)
+            self.drone_id = new_id
+            self._max_drone_id = max(self._max_drone_id, new_id)
+            if self.current_state != "MASTER":
+                self.switch_states("SLAVE")
+                self.destination_id = other.drone_id  # Reply directly to the sender
+                self.detected_drones = {self.drone_id}  # Reset detected drones to only include self
+                self._max_drone_id = self.drone_id
+                log.debug("New drone ID: %s", self.drone_id)
+                log.debug("Updated detected drones: %s", self.detected_drones)
+        # DronePacket().ping(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state)
+
+    def _on_slave_update(self, other):
+        update_info = other.params
+        new_drones = update_info.get("detected_drones", [])
+        self.detected_drones = set(new_drones)
+        self._max_drone_id = max(self.detected_drones, default=self.drone_id)
+        log.debug("Received UPDATE from MASTER. Updated detected drones: %s", self.detected_drones)
+        log.debug("Current drone ID: %s", self.drone_id)
+        self._pkt.ack(self.bh, drone_id=self.drone_id, destination_id=other.drone_id, current_state=self.current_state, ack_info={"status": "UPDATE_RECEIVED"})
+
+    def _on_master_ack(self, other):
+        log.debug("Received ACK from drone ID: %s with info: %s", other.drone_id, other.params)
+        status = other.params.get("status", "")
+        if status == "UPDATE_RECEIVED":
+            log.debug("Slave drone ID: %s acknowledged the update.", other.drone_id)
+            self.acked_drones.add(other.drone_id)
+            log.debug("Current acked drones: %s", self.acked_drones)
+            log.debug("Current drone ID: %s", self.drone_id)
\ No newline at end of file
@@ -45,6 +45,9 @@ def main():
         while True:
             current_time = time.time()
             
+            # Coalesce everything sent during this tick into one broadcast
+            controller.bh.begin_batch()
+            
             # Process incoming packets
             controller.process_incoming_packets()
             
@@ -75,6 +78,8 @@ def main():
             # Update state (includes master election logic)
             controller.update_state_based_on_network()
             
+            controller.bh.flush_batch()
+            
             time.sleep(0.1)  # Small delay to prevent high CPU usage
             
     except KeyboardInterrupt:
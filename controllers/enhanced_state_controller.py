@@ -1,3 +1,4 @@
+import asyncio
 import time
 import random
 import os
@@ -59,6 +60,16 @@ class EnhancedStateController:
         self.election_votes = {}  # Track votes during election
         self.has_voted = False
         
+        # Outbound packets are reused per action type; each send sets every
+        # field before serializing, so no per-send DronePacket allocation
+        self._id_conflict_packet = DronePacket()
+        self._ack_packet = DronePacket()
+        self._discovery_response_packet = DronePacket()
+        self._discovery_packet = DronePacket()
+        self._heartbeat_packet = DronePacket()
+        self._network_status_packet = DronePacket()
+        self._election_packet = DronePacket()
+        
         print(f"Enhanced State Controller initialized with drone ID: {self.drone_network.get_self_id()}")
     
     def process_incoming_packets(self):
@@ -72,7 +83,7 @@ class EnhancedStateController:
             
             try:
                 # Decode the packet
-                drone_packet = DronePacket(data.decode('utf-8'))
+                drone_packet = DronePacket(data)
                 self.handle_received_packet(drone_packet)
                 
             except Exception as e:
@@ -94,7 +105,7 @@ class EnhancedStateController:
             print(f"ID conflict detected with drone {sender_id}")
             new_id = self.drone_network.resolve_id_conflict()
             # Announce the resolution
-            DronePacket().id_conflict_resolution(
+            self._id_conflict_packet.id_conflict_resolution(
                 self.bh, new_id, -1, self.drone_network.self_drone.status.value, 
                 sender_id, new_id
             )
@@ -136,7 +147,7 @@ class EnhancedStateController:
         sender_id = packet.drone_id
         
         # Respond with our current state
-        DronePacket().ack(
+        self._ack_packet.ack(
             self.bh, self.drone_network.get_self_id(), sender_id,
             self.drone_network.self_drone.status.value,
             {
@@ -153,7 +164,7 @@ class EnhancedStateController:
         sender_id = packet.drone_id
         
         # Respond to discovery announcement
-        DronePacket().discovery_response(
+        self._discovery_response_packet.discovery_response(
             self.bh, self.drone_network.get_self_id(), sender_id,
             self.drone_network.self_drone.status.value,
             self.drone_network.self_drone.position,
@@ -242,8 +253,7 @@ class EnhancedStateController:
         if self.drone_network.get_self_id() not in known_drone_ids:
             known_drone_ids.append(self.drone_network.get_self_id())
         
-        packet = DronePacket()
-        packet.network_status(
+        self._network_status_packet.network_status(
             self.bh,
             self.drone_network.get_self_id(),
             self.drone_network.self_drone.status.value,
@@ -317,8 +327,7 @@ class EnhancedStateController:
         criteria = self.calculate_election_criteria(candidate_id)
         
         # Send our vote
-        packet = DronePacket()
-        packet.elect_master(
+        self._election_packet.elect_master(
             self.bh,
             self.drone_network.get_self_id(),
             self.drone_network.self_drone.status.value,
@@ -518,7 +527,7 @@ class EnhancedStateController:
     
     def send_discovery_announcement(self):
         """Send discovery announcement to find other drones"""
-        DronePacket().discovery_announce(
+        self._discovery_packet.discovery_announce(
             self.bh, self.drone_network.get_self_id(),
             self.drone_network.self_drone.status.value,
             self.drone_network.self_drone.position,
@@ -531,7 +540,7 @@ class EnhancedStateController:
     
     def send_heartbeat(self):
         """Send heartbeat to maintain network presence"""
-        DronePacket().heartbeat(
+        self._heartbeat_packet.heartbeat(
             self.bh, self.drone_network.get_self_id(),
             self.drone_network.self_drone.status.value,
             self.drone_network.self_drone.position,
@@ -544,7 +553,7 @@ class EnhancedStateController:
         """Share network topology with other drones"""
         known_drone_ids = list(self.drone_network.known_drones.keys())
         
-        DronePacket().network_status(
+        self._network_status_packet.network_status(
             self.bh, self.drone_network.get_self_id(),
             self.drone_network.self_drone.status.value,
             known_drone_ids,
@@ -595,78 +604,99 @@ class EnhancedStateController:
         print("Starting enhanced control loop...")
         
         while self.alive:
-            current_time = time.time()
-            
-            # Process incoming packets
-            self.process_incoming_packets()
+            self.control_step()
             
-            # Send discovery announcements when seeking
-            if (self.drone_network.self_drone.status == DroneStatus.SEEKING and
-                current_time - self.last_discovery_time > self.discovery_interval):
-                
-                self.send_discovery_announcement()
-                self.last_discovery_time = current_time
+            # Sleep to prevent excessive CPU usage
+            time.sleep(0.1)
+        
+        print("Enhanced control loop terminated.")
+    
+    async def async_control_loop(self):
+        """Control loop as a coroutine so many controllers can share one event loop"""
+        print("Starting enhanced control loop...")
+        
+        while self.alive:
+            self.control_step()
             
-            # Send periodic heartbeats when connected
-            if (self.drone_network.self_drone.status in [DroneStatus.CONNECTED, DroneStatus.MASTER, DroneStatus.SLAVE] and
-                current_time - self.last_heartbeat_time > self.heartbeat_interval):
-                
-                self.send_heartbeat()
-                self.last_heartbeat_time = current_time
+            # Yield to the other controllers on the loop instead of blocking
+            await asyncio.sleep(0.1)
+        
+        print("Enhanced control loop terminated.")
+    
+    def control_step(self):
+        """Run a single iteration of the control loop"""
+        current_time = time.time()
+        
+        # Process incoming packets
+        self.process_incoming_packets()
+        
+        # Send discovery announcements when seeking
+        if (self.drone_network.self_drone.status == DroneStatus.SEEKING and
+            current_time - self.last_discovery_time > self.discovery_interval):
             
-            # Share network status periodically
-            if (self.drone_network.network_established and
-                current_time - self.last_network_sync_time > self.network_sync_interval):
-                
-                self.send_network_status()
-                self.last_network_sync_time = current_time
+            self.send_discovery_announcement()
+            self.last_discovery_time = current_time
+        
+        # Send periodic heartbeats when connected
+        if (self.drone_network.self_drone.status in [DroneStatus.CONNECTED, DroneStatus.MASTER, DroneStatus.SLAVE] and
+            current_time - self.last_heartbeat_time > self.heartbeat_interval):
             
-            # Cleanup offline drones more frequently to detect master death faster
-            if current_time - self.last_cleanup_time > 15.0:  # Every 15 seconds instead of 60
-                initial_count = self.drone_network.get_drone_count()
-                self.drone_network.cleanup_offline_drones(timeout=self.master_timeout)
-                final_count = self.drone_network.get_drone_count()
-                
-                if final_count < initial_count:
-                    removed_count = initial_count - final_count
-                    print(f"🗑️ Cleaned up {removed_count} offline drones")
-                    
-                    # If master was removed during cleanup, trigger re-election
-                    if (self.drone_network.master_drone_id and 
-                        not self.drone_network.get_drone(self.drone_network.master_drone_id)):
-                        print(f"💀 Master {self.drone_network.master_drone_id} was cleaned up - clearing master")
-                        self.drone_network.master_drone_id = None
-                
-                self.last_cleanup_time = current_time
+            self.send_heartbeat()
+            self.last_heartbeat_time = current_time
+        
+        # Share network status periodically
+        if (self.drone_network.network_established and
+            current_time - self.last_network_sync_time > self.network_sync_interval):
             
-            # Update state based on network conditions
-            self.update_state_based_on_network()
+            self.send_network_status()
+            self.last_network_sync_time = current_time
+        
+        # Cleanup offline drones more frequently to detect master death faster
+        if current_time - self.last_cleanup_time > 15.0:  # Every 15 seconds instead of 60
+            initial_count = self.drone_network.get_drone_count()
+            self.drone_network.cleanup_offline_drones(timeout=self.master_timeout)
+            final_count = self.drone_network.get_drone_count()
             
-            # Display status periodically (every 10 seconds, but only once per interval)
-            # Skip frequent displays in quiet mode
-            if not self.quiet_mode and current_time - self.last_status_display_time > 10.0:
-                self.display_status()
-                self.last_status_display_time = current_time
+            if final_count < initial_count:
+                removed_count = initial_count - final_count
+                print(f"🗑️ Cleaned up {removed_count} offline drones")
+                
+                # If master was removed during cleanup, trigger re-election
+                if (self.drone_network.master_drone_id and 
+                    not self.drone_network.get_drone(self.drone_network.master_drone_id)):
+                    print(f"💀 Master {self.drone_network.master_drone_id} was cleaned up - clearing master")
+                    self.drone_network.master_drone_id = None
             
-            # Sleep to prevent excessive CPU usage
-            time.sleep(0.1)
+            self.last_cleanup_time = current_time
         
-        print("Enhanced control loop terminated.")
-    
+        # Update state based on network conditions
+        self.update_state_based_on_network()
+        
+        # Display status periodically (every 10 seconds, but only once per interval)
+        # Skip frequent displays in quiet mode
+        if not self.quiet_mode and current_time - self.last_status_display_time > 10.0:
+            self.display_status()
+            self.last_status_display_time = current_time
+
     def display_status(self):
         """Display current network status"""
         status = self.drone_network.get_discovery_status()
         online_count = self.drone_network.get_online_drone_count()
         total_count = self.drone_network.get_drone_count()
         
-        print(f"\n=== Drone Network Status ===")
-        print(f"Self ID: {self.drone_network.get_self_id()}")
-        print(f"Status: {self.drone_network.self_drone.status.value}")
-        print(f"Network: {status}")
-        print(f"Drones: {online_count} online, {total_count} total")
+        # Build the whole block and write it once instead of one print per line
+        lines = [
+            "\n=== Drone Network Status ===",
+            f"Self ID: {self.drone_network.get_self_id()}",
+            f"Status: {self.drone_network.self_drone.status.value}",
+            f"Network: {status}",
+            f"Drones: {online_count} online, {total_count} total",
+        ]
         if self.drone_network.master_drone_id:
-            print(f"Master: {self.drone_network.master_drone_id}")
-        print("============================\n")
+            lines.append(f"Master: {self.drone_network.master_drone_id}")
+        lines.append("============================\n")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def display_detailed_network(self):
         """Display detailed network visualization"""
@@ -19,6 +19,11 @@ class DroneState:
     Tracks identity, position, status, and network relationships.
     """
     
+    # One instance per observed drone, kept for the life of the process
+    __slots__ = ("drone_id", "status", "last_seen", "discovery_time", "position",
+                 "battery_level", "is_self", "ping_count", "response_count",
+                 "signal_strength", "capabilities")
+    
     def __init__(self, drone_id: Optional[int] = None):
         self.drone_id = drone_id if drone_id is not None else self._generate_random_id()
         self.status = DroneStatus.SEEKING
@@ -1,11 +1,38 @@
 import RNS
+import collections
+import struct
+import threading
 import time
 
+# Marks a packet carrying several length-prefixed frames. A plain packet
+# starts with its destination_id header (0x00.. or 0xff..), never with this.
+BATCH_MARKER = b"\xdd"
+_FRAME_LENGTH = struct.Struct("<H")
+
+def unpack_batch(data):
+    """Split a batched broadcast into its frames; plain packets pass through.
+    A truncated or malformed batch yields no frames at all."""
+    if not data.startswith(BATCH_MARKER):
+        return [data]
+    frames = []
+    offset = len(BATCH_MARKER)
+    while offset < len(data):
+        if offset + _FRAME_LENGTH.size > len(data):
+            return []
+        (length,) = _FRAME_LENGTH.unpack_from(data, offset)
+        offset += _FRAME_LENGTH.size
+        if offset + length > len(data):
+            return []
+        frames.append(data[offset:offset + length])
+        offset += length
+    return frames
+
 class BroadcastHandler:
     """
     BroadcastHandler provides a simple interface for broadcasting and receiving messages
     using Reticulum's PLAIN destination. It manages a buffer of received packets and
-    allows sending broadcast messages to all listeners.
+    allows sending broadcast messages to all listeners. Broadcasts echoed back to
+    this handler are dropped on receipt, before they reach the buffer.
     Attributes:
         packet_buffer (list): Stores tuples of (timestamp, data, packet) for received packets.
         broadcast_destination (RNS.Destination): The Reticulum destination for broadcasting.
@@ -16,12 +43,29 @@ class BroadcastHandler:
             Retrieves and removes the oldest received packet from the buffer.
             Returns:
                 tuple or None: (timestamp, data, packet) if available, otherwise None.
+        wait_for_packet(timeout=None):
+            Blocks until a received packet is buffered or the timeout expires.
+            Args:
+                timeout (float or None): Maximum seconds to wait, None waits forever.
+            Returns:
+                bool: True if a packet is available, False on timeout.
         send_broadcast(data):
             Sends a broadcast message with the given data to all listeners.
+            Between begin_batch() and flush_batch() the data is queued instead.
             Args:
                 data (bytes): The data to broadcast.
             Returns:
                 bool: True if the packet was sent successfully, False otherwise.
+        send_broadcast_batch(frames):
+            Sends several messages packed into as few broadcasts as fit the
+            link MDU. Receivers split them back into individual packets.
+            Args:
+                frames (list[bytes]): The messages to broadcast.
+            Returns:
+                bool: True if every broadcast was sent successfully.
+        begin_batch() / flush_batch():
+            Queue every send_broadcast() call until flush_batch(), which sends
+            the queued messages with send_broadcast_batch().
     Usage example:
         handler = BroadcastHandler()
         handler.send_broadcast(b"Hello, world!")
@@ -36,6 +80,9 @@ class BroadcastHandler:
     def __init__(self, configpath="../.reticulum_config"):
         # We must first initialise Reticulum
         self.packet_buffer = []
+        self.packet_available = threading.Condition()  # Notified on every receive
+        self._pending = None  # Outbound frames queued while batching
+        self._recent_sent = collections.deque(maxlen=16)  # Our own last payloads, to spot echoes
         _ = RNS.Reticulum(configpath)
 
         # We create a PLAIN destination. This is an uncencrypted endpoint
@@ -51,17 +98,70 @@ class BroadcastHandler:
 
         # We specify a callback that will get called every time
         # the destination receives data.
-        self.broadcast_destination.set_packet_callback(
-            lambda data, packet : self.packet_buffer.append((time.monotonic_ns(), data, packet))
-            )
+        self.broadcast_destination.set_packet_callback(self._on_packet)
+
+    def _on_packet(self, data, packet):
+        received = time.monotonic_ns()
+        with self.packet_available:
+            # Every payload carries a fresh timestamp, so an exact match can
+            # only be our own broadcast coming back; skip it before any parsing
+            if data in self._recent_sent:
+                return
+            for frame in unpack_batch(data):
+                self.packet_buffer.append((received, frame, packet))
+            self.packet_available.notify_all()
         
     def get_packet(self):
         if len(self.packet_buffer) > 0:
             return self.packet_buffer.pop(0)
         else:
             return None
+
+    def wait_for_packet(self, timeout=None):
+        with self.packet_available:
+            return self.packet_available.wait_for(lambda: len(self.packet_buffer) > 0, timeout)
         
     def send_broadcast(self, data):
+        if self._pending is not None:
+            self._pending.append(data)
+            return True
+        return self._send(data)
+
+    def send_broadcast_batch(self, frames):
+        sent = True
+        chunk = []
+        size = len(BATCH_MARKER)
+        for frame in frames:
+            framed_size = _FRAME_LENGTH.size + len(frame)
+            if chunk and size + framed_size > RNS.Packet.PLAIN_MDU:
+                sent = self._send_chunk(chunk) and sent
+                chunk = []
+                size = len(BATCH_MARKER)
+            chunk.append(frame)
+            size += framed_size
+        if chunk:
+            sent = self._send_chunk(chunk) and sent
+        return sent
+
+    def begin_batch(self):
+        self._pending = []
+
+    def flush_batch(self):
+        pending, self._pending = self._pending, None
+        if not pending:
+            return True
+        return self.send_broadcast_batch(pending)
+
+    def _send_chunk(self, frames):
+        # A lone frame goes out as a plain packet, no framing overhead
+        if len(frames) == 1:
+            return bool(self._send(frames[0]))
+        payload = BATCH_MARKER + b"".join(_FRAME_LENGTH.pack(len(f)) + f for f in frames)
+        return bool(self._send(payload))
+
+    def _send(self, data):
+        with self.packet_available:
+            self._recent_sent.append(data)
         packet = RNS.Packet(self.broadcast_destination, data, create_receipt=True)
         return packet.send()
 
@@ -1,31 +1,87 @@
+import functools
 import json
+import struct
 import time
 from networking.broadcast_controller import BroadcastHandler
 
+# orjson parses straight from bytes and is several times faster; fall back to
+# the stdlib with the same compact separators so the wire format is identical
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# Wire precision for telemetry: battery in 0.5% steps, positions in centimetres
+BATTERY_SCALE = 2
+POSITION_SCALE = 100
+
+def quantize_params(params):
+    """Pack battery_level and position into small integers for the wire"""
+    if "battery_level" not in params and "position" not in params:
+        return params
+    params = dict(params)
+    if params.get("battery_level") is not None:
+        params["battery_level"] = int(round(params["battery_level"] * BATTERY_SCALE))
+    if params.get("position") is not None:
+        params["position"] = [int(round(c * POSITION_SCALE)) for c in params["position"]]
+    return params
+
+def dequantize_params(params):
+    """Restore battery_level and position from their wire integers"""
+    if params.get("battery_level") is not None:
+        params["battery_level"] = params["battery_level"] / BATTERY_SCALE
+    if params.get("position") is not None:
+        params["position"] = [c / POSITION_SCALE for c in params["position"]]
+    return params
+
+# Fixed routing header in front of the JSON body: destination_id, drone_id.
+# Receivers can filter on it without touching the JSON at all.
+HEADER = struct.Struct("!ii")
+
+def should_process(data, self_id):
+    """Cheap pre-parse check: True if a raw packet is a broadcast or addressed to self_id"""
+    # Foreign payloads on the shared destination may be too short for a header
+    if len(data) < HEADER.size:
+        return False
+    destination_id, _ = HEADER.unpack_from(data)
+    return destination_id == -1 or destination_id == self_id
+
+@functools.lru_cache(maxsize=64)
+def _render_tail(current_state, action):
+    """JSON text after the timestamp for a packet without params (PING, SET_SLAVE)"""
+    # Only the timestamp changes between sends, so the rest is rendered once
+    return _dumps({"current_state": current_state, "action": action, "params": {}})[1:]
+
 class DronePacket:
-    def __init__(self, json_string=None):
-        if json_string:
-            self.decode_json(json_string)
+    def __init__(self, data=None):
+        if data:
+            self.decode_json(data)
 
-    def to_json(self):
+    def to_bytes(self):
+        header = HEADER.pack(self.destination_id, self.drone_id)
+        if not self.params:
+            return header + b'{"timestamp":' + _dumps(self.timestamp) + b"," + \
+                _render_tail(self.current_state, self.request_action)
         packet = {
             "timestamp": self.timestamp,
-            "drone_id": self.drone_id,
-            "destination_id": self.destination_id,
             "current_state": self.current_state,
             "action": self.request_action,
-            "params": self.params
+            "params": quantize_params(self.params)
         }
-        return json.dumps(packet)
+        return header + _dumps(packet)
     
-    def decode_json(self, json_string):
-        packet = json.loads(json_string)
+    def decode_json(self, data):
+        self.destination_id, self.drone_id = HEADER.unpack_from(data)
+        # Both parsers take the received bytes directly, no decode step needed
+        packet = _loads(data[HEADER.size:])
         self.timestamp = packet.get("timestamp", None)
-        self.drone_id = packet.get("drone_id", None)
-        self.destination_id = packet.get("destination_id", None)
         self.current_state = packet.get("current_state", None)
         self.request_action = packet.get("action", None)
-        self.params = packet.get("params", {})
+        self.params = dequantize_params(packet.get("params", {}))
         
     def command(self, bh : BroadcastHandler, drone_id, destination_id, current_state, command, params):
         self.timestamp = time.monotonic()
@@ -34,27 +90,27 @@ class DronePacket:
         self.current_state = current_state
         self.request_action = command
         self.params = params
-        # return bh.send_broadcast(self.to_json().encode('utf-8'))
+        # return bh.send_broadcast(self.to_bytes())
 
     def ping(self, bh : BroadcastHandler, drone_id, destination_id, current_state):
         self.command(bh, drone_id, destination_id, current_state, "PING", {})
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def set_slave(self, bh : BroadcastHandler, drone_id, destination_id, current_state):
         self.command(bh, drone_id, destination_id, current_state, "SET_SLAVE", {})
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def set_id(self, bh : BroadcastHandler, drone_id, destination_id, current_state, new_id):
         self.command(bh, drone_id, destination_id, current_state, "SET_ID", {"new_id": new_id})
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def update(self, bh : BroadcastHandler, drone_id, destination_id, current_state, update_info=None):
         self.command(bh, drone_id, destination_id, current_state, "UPDATE", update_info if update_info else {})
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
 
     def ack(self, bh : BroadcastHandler, drone_id, destination_id, current_state, ack_info=None):
         self.command(bh, drone_id, destination_id, current_state, "ACK", ack_info if ack_info else {})
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def discovery_announce(self, bh : BroadcastHandler, drone_id, current_state, position=(0,0,0), battery_level=100.0, capabilities=None):
         """Announce this drone's presence and capabilities to the network"""
@@ -65,7 +121,7 @@ class DronePacket:
             "discovery_time": time.time()
         }
         self.command(bh, drone_id, -1, current_state, "DISCOVERY_ANNOUNCE", params)
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def discovery_response(self, bh : BroadcastHandler, drone_id, destination_id, current_state, position=(0,0,0), battery_level=100.0, capabilities=None):
         """Respond to a discovery announcement"""
@@ -76,7 +132,7 @@ class DronePacket:
             "response_time": time.time()
         }
         self.command(bh, drone_id, destination_id, current_state, "DISCOVERY_RESPONSE", params)
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def heartbeat(self, bh : BroadcastHandler, drone_id, current_state, position=(0,0,0), battery_level=100.0):
         """Send heartbeat to maintain network presence"""
@@ -86,7 +142,7 @@ class DronePacket:
             "heartbeat_time": time.time()
         }
         self.command(bh, drone_id, -1, current_state, "HEARTBEAT", params)
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def network_status(self, bh : BroadcastHandler, drone_id, current_state, known_drones=None, master_id=None):
         """Share network topology information"""
@@ -96,7 +152,7 @@ class DronePacket:
             "status_time": time.time()
         }
         self.command(bh, drone_id, -1, current_state, "NETWORK_STATUS", params)
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def id_conflict_resolution(self, bh : BroadcastHandler, drone_id, destination_id, current_state, old_id, new_id):
         """Announce ID conflict resolution"""
@@ -106,7 +162,7 @@ class DronePacket:
             "resolution_time": time.time()
         }
         self.command(bh, drone_id, destination_id, current_state, "ID_CONFLICT_RESOLUTION", params)
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
     def elect_master(self, bh : BroadcastHandler, drone_id, current_state, candidate_id, criteria=None):
         """Participate in master election process"""
@@ -116,5 +172,5 @@ class DronePacket:
             "election_time": time.time()
         }
         self.command(bh, drone_id, -1, current_state, "ELECT_MASTER", params)
-        return bh.send_broadcast(self.to_json().encode('utf-8'))
+        return bh.send_broadcast(self.to_bytes())
     
\ No newline at end of file
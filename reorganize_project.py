@@ -7,8 +7,10 @@ and updates import statements accordingly.
 """
 
 import os
+import mmap
 import shutil
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 class ProjectReorganizer:
@@ -81,7 +83,15 @@ class ProjectReorganizer:
             "drone_visualizer": "visualization.drone_visualizer",
             "network_monitor": "visualization.network_monitor"
         }
-    
+
+        # Single alternation over every old module name so each file is
+        # scanned once instead of once per mapping/pattern pair.
+        # Longest names first so a prefix never shadows a longer module.
+        alt = "|".join(re.escape(k) for k in sorted(self.import_mapping, key=len, reverse=True))
+        self._import_re = re.compile(rf"^([ \t]*(?:from|import)[ \t]+)({alt})(?!\w)", re.MULTILINE)
+        # Same pattern over raw bytes, used to skip files without touching them
+        self._import_re_bytes = re.compile(self._import_re.pattern.encode(), re.MULTILINE)
+
     def create_backup(self):
         """Create backup of original files"""
         if self.backup_dir.exists():
@@ -89,10 +99,10 @@ class ProjectReorganizer:
         
         self.backup_dir.mkdir()
         
-        # Copy all Python files to backup
-        for file in self.project_root.glob("*.py"):
-            if file.name != "reorganize_project.py":
-                shutil.copy2(file, self.backup_dir / file.name)
+        # Copy all Python files to backup (independent I/O, so run in parallel)
+        files = [f for f in self.project_root.glob("*.py") if f.name != "reorganize_project.py"]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(lambda f: shutil.copy2(f, self.backup_dir / f.name), files))
         
         print(f"✅ Created backup in {self.backup_dir}")
     
@@ -133,28 +143,26 @@ class ProjectReorganizer:
     def update_imports_in_file(self, file_path):
         """Update import statements in a single file"""
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            # Update import statements
-            for old_import, new_import in self.import_mapping.items():
-                # Handle different import patterns
-                patterns = [
-                    (f"from {old_import} import", f"from {new_import} import"),
-                    (f"import {old_import}", f"import {new_import}"),
-                    (f"from {old_import}\\.", f"from {new_import}."),
-                ]
-                
-                for old_pattern, new_pattern in patterns:
-                    content = re.sub(old_pattern, new_pattern, content)
-            
-            # Write back if changed
-            if content != original_content:
-                with open(file_path, 'w') as f:
-                    f.write(content)
-                return True
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return False
+
+                # Scan the mapped file first; most files need no changes and
+                # are never decoded or rewritten
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if not self._import_re_bytes.search(mm):
+                        return False
+                    content = mm[:].decode('utf-8')
+
+            # Update import statements (from X import / import X / from X.y)
+            content = self._import_re.sub(
+                lambda m: m.group(1) + self.import_mapping[m.group(2)], content
+            )
+
+            # Same encoding and line endings as were read from the map
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+            return True
             
         except Exception as e:
             print(f"❌ Error updating {file_path}: {e}")
@@ -164,13 +172,16 @@ class ProjectReorganizer:
     
     def update_all_imports(self):
         """Update import statements in all Python files"""
-        updated_files = []
-        
-        # Update imports in all Python files
-        for py_file in self.project_root.rglob("*.py"):
-            if py_file.name != "reorganize_project.py":
-                if self.update_imports_in_file(py_file):
-                    updated_files.append(str(py_file.relative_to(self.project_root)))
+        files = [p for p in self.project_root.rglob("*.py") if p.name != "reorganize_project.py"]
+
+        # Each file is read/rewritten independently, so overlap the I/O
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(self.update_imports_in_file, files))
+
+        updated_files = [
+            str(py_file.relative_to(self.project_root))
+            for py_file, updated in zip(files, results) if updated
+        ]
         
         if updated_files:
             print(f"\n🔄 Updated imports in {len(updated_files)} files:")
@@ -1,3 +1,5 @@
+import asyncio
+import concurrent.futures
 import os
 import sys
 import threading
@@ -13,34 +15,51 @@ class DroneSpawner:
     
     def __init__(self):
         self.controllers = {}
+        # Every controller runs as a task on this one event loop, so the
+        # spawner needs a single background thread instead of one per drone
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
     
     def spawn_drone(self, drone_id):
-        """Spawn a new drone controller thread"""
+        """Spawn a new drone controller task on the shared event loop"""
         if drone_id in self.controllers:
             print(f"❌ Drone {drone_id} already exists")
             return False
         
         try:
             controller = EnhancedStateController(drone_id)
-            thread = threading.Thread(target=controller.control_loop, daemon=True)
-            thread.start()
-            self.controllers[drone_id] = (controller, thread)
+            task = asyncio.run_coroutine_threadsafe(controller.async_control_loop(), self.loop)
+            self.controllers[drone_id] = (controller, task)
             print(f"✅ Spawned drone {drone_id}")
             return True
         except Exception as e:
             print(f"❌ Failed to spawn drone {drone_id}: {e}")
             return False
         
+    def spawn_multiple(self, count, start_id=1):
+        """Spawn several drone controllers back to back"""
+        # Controllers share the event loop, so there is no process start-up
+        # race to wait out between spawns
+        spawned_ids = [drone_id for drone_id in range(start_id, start_id + count)
+                       if self.spawn_drone(drone_id)]
+        print(f"✅ Spawned drones: {spawned_ids}")
+        return spawned_ids
+        
     def stop_drone(self, drone_id):
         """Stop a specific drone controller"""
         if drone_id in self.controllers:
             try:
-                controller, thread = self.controllers[drone_id]
+                controller, task = self.controllers[drone_id]
                 controller.stop()
-                thread.join(timeout=3)
-                del self.controllers[drone_id]
-                print(f"🛑 Stopped drone {drone_id}")
-                return True
+                # Like a thread join: wait without re-raising a crash from the loop
+                concurrent.futures.wait([task], timeout=3)
+                if task.done():
+                    del self.controllers[drone_id]
+                    print(f"🛑 Stopped drone {drone_id}")
+                    return True
+                print(f"⚠️  Drone {drone_id} did not stop within 3 seconds")
+                return False
             except Exception as e:
                 print(f"❌ Error stopping drone {drone_id}: {e}")
                 return False
@@ -56,7 +75,7 @@ class DroneSpawner:
     def interactive_shell(self):
         """Simple interactive shell to manage drones"""
         print("🚁 Drone Spawner Interactive Shell")
-        print("Commands: spawn <id>, stop <id>, list, exit")
+        print("Commands: spawn <id>, spawn_multiple <n> [start_id], stop <id>, list, exit")
         
         while True:
             try:
@@ -64,6 +83,9 @@ class DroneSpawner:
                 if command.startswith("spawn "):
                     _, drone_id = command.split()
                     self.spawn_drone(int(drone_id))
+                elif command.startswith("spawn_multiple "):
+                    args = command.split()[1:]
+                    self.spawn_multiple(*map(int, args))
                 elif command.startswith("stop "):
                     _, drone_id = command.split()
                     self.stop_drone(int(drone_id))
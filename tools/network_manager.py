@@ -16,6 +16,7 @@ if project_root not in sys.path:
 
 import time
 import random
+import signal
 import threading
 from typing import Optional
 from controllers.enhanced_state_controller import EnhancedStateController
@@ -198,8 +199,14 @@ def demo_dynamic_network():
         print(manager.get_network_status())
         
         print("\n✅ Demo complete - press Ctrl+C to exit")
-        while True:
-            time.sleep(1)
+        # Block until Ctrl+C instead of waking up every second
+        if hasattr(signal, "pause"):
+            signal.pause()
+        else:
+            # Windows has no signal.pause(), and a bare Event.wait() there
+            # cannot be interrupted by Ctrl+C
+            while True:
+                time.sleep(1)
     
     except KeyboardInterrupt:
         print("\n🛑 Stopping demo...")
@@ -215,7 +222,6 @@ def interactive_network_manager():
         manager.shutdown()
         sys.exit(0)
     
-    import signal
     signal.signal(signal.SIGINT, signal_handler)
     
     print("🚁 INTERACTIVE NETWORK MANAGER")
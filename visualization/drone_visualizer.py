@@ -13,8 +13,12 @@ but observes the network through RNS packet monitoring.
 """
 
 import os
+import io
 import sys
 import threading
+import contextlib
+import functools
+import queue
 from typing import Dict, List, Optional, Tuple
 import time
 import json
@@ -27,6 +31,41 @@ if project_root not in sys.path:
 import RNS
 from core.drone_state import DroneNetwork, DroneStatus, DroneState
 from networking.drone_packet import DronePacket
+from networking.broadcast_controller import unpack_batch
+
+# State strings as sent by the controllers, and actions that imply SEEKING
+_STATUS_MAP = {
+    "SEEKING": DroneStatus.SEEKING,
+    "CONNECTED": DroneStatus.CONNECTED,
+    "MASTER": DroneStatus.MASTER,
+    "SLAVE": DroneStatus.SLAVE,
+    "OFFLINE": DroneStatus.OFFLINE,
+    "LOST": DroneStatus.LOST
+}
+_SEEK_ACTIONS = frozenset(("DISCOVERY_ANNOUNCE", "DISCOVERY_RESPONSE"))
+
+# Slowest regular sender on the network: the legacy StateController pings,
+# updates and acks once per time_step (3s, +/-2% jitter). EnhancedStateController
+# heartbeats every 0.6s. Drones are dropped once they miss about two 3s sends.
+_SLOWEST_SEND_INTERVAL = 3.0
+STALE_DRONE_TIMEOUT = 2 * _SLOWEST_SEND_INTERVAL
+
+# Display tables, built once instead of on every drone of every refresh
+_STATUSES = tuple(DroneStatus)
+_STATUS_SYMBOLS = {
+    DroneStatus.OFFLINE: "⚫",
+    DroneStatus.SEEKING: "🔍",
+    DroneStatus.CONNECTED: "🟢",
+    DroneStatus.MASTER: "👑",
+    DroneStatus.SLAVE: "🔵",
+    DroneStatus.LOST: "❌"
+}
+_COMPACT_STATUS_SYMBOLS = {
+    DroneStatus.SEEKING: "🔍",
+    DroneStatus.CONNECTED: "🟢", 
+    DroneStatus.MASTER: "👑",
+    DroneStatus.SLAVE: "🔵"
+}
 
 class PassiveBroadcastHandler:
     """
@@ -34,7 +73,9 @@ class PassiveBroadcastHandler:
     """
     
     def __init__(self):
-        self.packet_buffer = []
+        # Bounded: under a burst new packets are dropped instead of the
+        # queue growing without limit. Readers block on it instead of polling.
+        self.packet_queue = queue.Queue(maxsize=4096)
         
         # Don't initialize RNS - assume it's already running
         # Just create the destination for listening
@@ -49,18 +90,38 @@ class PassiveBroadcastHandler:
             )
             
             # Set up packet callback
-            self.broadcast_destination.set_packet_callback(
-                lambda data, packet: self.packet_buffer.append((time.monotonic_ns(), data, packet))
-            )
+            self.broadcast_destination.set_packet_callback(self._on_packet)
         except Exception as e:
             print(f"Error processing network status: {e}")
             self.broadcast_destination = None
     
-    def get_packet(self):
-        if len(self.packet_buffer) > 0:
-            return self.packet_buffer.pop(0)
-        else:
+    def _on_packet(self, data, packet):
+        # Drones may coalesce several messages into one broadcast
+        received = time.monotonic_ns()
+        for frame in unpack_batch(data):
+            try:
+                self.packet_queue.put_nowait((received, frame, packet))
+            except queue.Full:
+                pass  # Never stall the RNS callback thread
+    
+    def get_packet(self, timeout=None):
+        """Return the oldest packet, waiting up to timeout seconds if none is queued"""
+        try:
+            if timeout:
+                return self.packet_queue.get(timeout=timeout)
+            return self.packet_queue.get_nowait()
+        except queue.Empty:
             return None
+    
+    def drain(self, n=256):
+        """Remove and return up to n of the oldest queued packets without waiting"""
+        packets = []
+        for _ in range(n):
+            try:
+                packets.append(self.packet_queue.get_nowait())
+            except queue.Empty:
+                break
+        return packets
 
 class PassiveNetworkState:
     """
@@ -71,6 +132,9 @@ class PassiveNetworkState:
         self.known_drones: Dict[int, DroneState] = {}
         self.master_drone_id: Optional[int] = None
         self.network_established = False
+        # Guards every write to known_drones; the monitor thread and the
+        # display thread (via master detection) both modify it
+        self.lock = threading.RLock()
         
     def add_or_update_drone(self, drone_id: int, status: Optional[DroneStatus] = None, 
                            position: Tuple[float, float, float] = (0.0, 0.0, 0.0),
@@ -80,22 +144,23 @@ class PassiveNetworkState:
         if status is None:
             status = DroneStatus.CONNECTED
             
-        if drone_id in self.known_drones:
-            # Update existing drone
-            drone = self.known_drones[drone_id]
-            drone.status = status
-            drone.update_position(*position)
-            drone.update_battery(battery_level)
-            drone.signal_strength = signal_strength
-            drone.update_last_seen()
-        else:
-            # Add new drone
-            drone = DroneState(drone_id)
-            drone.status = status
-            drone.update_position(*position)
-            drone.update_battery(battery_level)
-            drone.signal_strength = signal_strength
-            self.known_drones[drone_id] = drone
+        with self.lock:
+            if drone_id in self.known_drones:
+                # Update existing drone
+                drone = self.known_drones[drone_id]
+                drone.status = status
+                drone.update_position(*position)
+                drone.update_battery(battery_level)
+                drone.signal_strength = signal_strength
+                drone.update_last_seen()
+            else:
+                # Add new drone
+                drone = DroneState(drone_id)
+                drone.status = status
+                drone.update_position(*position)
+                drone.update_battery(battery_level)
+                drone.signal_strength = signal_strength
+                self.known_drones[drone_id] = drone
             
         return drone
     
@@ -105,7 +170,9 @@ class PassiveNetworkState:
     
     def get_online_drones(self, timeout: float = 30.0):
         """Get list of all online drones"""
-        return [drone for drone in self.known_drones.values() if drone.is_online(timeout)]
+        # One clock read for the whole scan instead of one per is_online() call
+        cutoff = time.time() - timeout
+        return [drone for drone in self.known_drones.values() if drone.last_seen > cutoff]
     
     def get_drone_count(self) -> int:
         """Get total number of known drones"""
@@ -113,7 +180,8 @@ class PassiveNetworkState:
     
     def get_online_drone_count(self, timeout: float = 30.0) -> int:
         """Get number of online drones"""
-        return len(self.get_online_drones(timeout))
+        cutoff = time.time() - timeout
+        return sum(1 for drone in self.known_drones.values() if drone.last_seen > cutoff)
     
     def get_discovery_status(self) -> str:
         """Get a human-readable discovery status"""
@@ -145,58 +213,60 @@ class PassiveNetworkState:
     
     def synchronize_master_status(self, master_id):
         """Ensure consistency between master_drone_id and drone status"""
-        try:
-            # First, clear any existing master status from all drones
-            for drone in self.get_all_drones():
-                if drone.status == DroneStatus.MASTER and drone.drone_id != master_id:
-                    drone.status = DroneStatus.SLAVE
+        with self.lock:
+            try:
+                # First, clear any existing master status from all drones
+                for drone in self.get_all_drones():
+                    if drone.status == DroneStatus.MASTER and drone.drone_id != master_id:
+                        drone.status = DroneStatus.SLAVE
             
-            # Set the correct drone as master
-            master_drone = None
-            for drone_id, drone in self.known_drones.items():
-                if drone_id == master_id:
-                    drone.status = DroneStatus.MASTER
-                    master_drone = drone
-                    break
+                # Set the correct drone as master
+                master_drone = None
+                for drone_id, drone in self.known_drones.items():
+                    if drone_id == master_id:
+                        drone.status = DroneStatus.MASTER
+                        master_drone = drone
+                        break
             
-            # If master drone doesn't exist in our list, create it
-            if not master_drone and master_id:
-                self.add_or_update_drone(
-                    master_id, 
-                    DroneStatus.MASTER,
-                    position=(0, 0, 0),
-                    battery_level=100.0
-                )
+                # If master drone doesn't exist in our list, create it
+                if not master_drone and master_id:
+                    self.add_or_update_drone(
+                        master_id, 
+                        DroneStatus.MASTER,
+                        position=(0, 0, 0),
+                        battery_level=100.0
+                    )
                 
-        except Exception as e:
-            print(f"Error synchronizing master status: {e}")
+            except Exception as e:
+                print(f"Error synchronizing master status: {e}")
     
     def detect_actual_master(self):
         """Detect the actual master from drone statuses and sync master_drone_id"""
-        try:
-            # Find drones with MASTER status
-            master_drones = [d for d in self.get_all_drones() 
-                           if d.status == DroneStatus.MASTER]
+        with self.lock:
+            try:
+                # Find drones with MASTER status
+                master_drones = [d for d in self.get_all_drones() 
+                               if d.status == DroneStatus.MASTER]
             
-            if len(master_drones) == 1:
-                # Single master found - this is the correct master
-                actual_master_id = master_drones[0].drone_id
-                if self.master_drone_id != actual_master_id:
-                    self.master_drone_id = actual_master_id
-            elif len(master_drones) > 1:
-                # Multiple masters detected - this shouldn't happen, log it
-                master_ids = [d.drone_id for d in master_drones]
-                print(f"⚠️ Multiple masters detected: {master_ids}")
-                # Keep the lowest ID as master for consistency
-                correct_master = min(master_ids)
-                self.master_drone_id = correct_master
-                self.synchronize_master_status(correct_master)
-            elif len(master_drones) == 0:
-                # No master found
-                self.master_drone_id = None
+                if len(master_drones) == 1:
+                    # Single master found - this is the correct master
+                    actual_master_id = master_drones[0].drone_id
+                    if self.master_drone_id != actual_master_id:
+                        self.master_drone_id = actual_master_id
+                elif len(master_drones) > 1:
+                    # Multiple masters detected - this shouldn't happen, log it
+                    master_ids = [d.drone_id for d in master_drones]
+                    print(f"⚠️ Multiple masters detected: {master_ids}")
+                    # Keep the lowest ID as master for consistency
+                    correct_master = min(master_ids)
+                    self.master_drone_id = correct_master
+                    self.synchronize_master_status(correct_master)
+                elif len(master_drones) == 0:
+                    # No master found
+                    self.master_drone_id = None
                     
-        except Exception as e:
-            print(f"Error detecting actual master: {e}")
+            except Exception as e:
+                print(f"Error detecting actual master: {e}")
 
 class PassiveNetworkMonitor:
     """
@@ -246,15 +316,23 @@ class PassiveNetworkMonitor:
         
     def _monitor_packets(self):
         """Monitor incoming packets in background thread"""
+        next_cleanup = time.monotonic() + 2.0
         while self.running:
             try:
+                # Stale-drone cleanup runs on a coarse timer, not per packet
+                if time.monotonic() >= next_cleanup:
+                    self.cleanup_stale_drones()
+                    next_cleanup = time.monotonic() + 2.0
+                
                 if self.broadcast_handler:
-                    packet_info = self.broadcast_handler.get_packet()
-                    if packet_info:
-                        timestamp, data, packet = packet_info
+                    # Sleep in the queue until a packet arrives; the timeout
+                    # only bounds how long stop_monitoring() waits for us
+                    packet_info = self.broadcast_handler.get_packet(timeout=0.25)
+                    if packet_info is None:
+                        continue
+                    # Then handle everything else that is already queued
+                    for timestamp, data, packet in [packet_info] + self.broadcast_handler.drain():
                         self._process_packet(data, timestamp)
-                    else:
-                        time.sleep(0.1)  # Small delay when no packets
                 else:
                     time.sleep(0.1)
             except Exception as e:
@@ -264,14 +342,13 @@ class PassiveNetworkMonitor:
     def _process_packet(self, data, timestamp):
         """Process received packet data"""
         try:
-            # Try to parse as JSON
-            json_str = data.decode('utf-8')
-            packet_data = json.loads(json_str)
+            # Decode the routing header and JSON body
+            packet = DronePacket(data)
             
-            drone_id = packet_data.get("drone_id")
-            action = packet_data.get("action", "")
-            params = packet_data.get("params", {})
-            current_state = packet_data.get("current_state", "UNKNOWN")
+            drone_id = packet.drone_id
+            action = packet.request_action or ""
+            params = packet.params
+            current_state = packet.current_state or "UNKNOWN"
             
             if drone_id is None:
                 return
@@ -285,7 +362,7 @@ class PassiveNetworkMonitor:
             
             # Convert state string to DroneStatus enum
             try:
-                if action in ["DISCOVERY_ANNOUNCE", "DISCOVERY_RESPONSE"]:
+                if action in _SEEK_ACTIONS:
                     status = DroneStatus.SEEKING
                 elif action == "HEARTBEAT":
                     status = self._parse_status(current_state)
@@ -310,19 +387,13 @@ class PassiveNetworkMonitor:
             # Silently ignore malformed packets
             pass
     
-    def _parse_status(self, status_str):
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _parse_status(status_str):
         """Parse status string to DroneStatus enum"""
+        # Only a handful of distinct strings are ever seen, so results are cached
         try:
-            # Handle common status strings
-            status_map = {
-                "SEEKING": DroneStatus.SEEKING,
-                "CONNECTED": DroneStatus.CONNECTED,
-                "MASTER": DroneStatus.MASTER,
-                "SLAVE": DroneStatus.SLAVE,
-                "OFFLINE": DroneStatus.OFFLINE,
-                "LOST": DroneStatus.LOST
-            }
-            return status_map.get(status_str.upper(), DroneStatus.CONNECTED)
+            return _STATUS_MAP.get(status_str.upper(), DroneStatus.CONNECTED)
         except:
             return DroneStatus.CONNECTED
     
@@ -356,20 +427,31 @@ class PassiveNetworkMonitor:
         except:
             pass
     
-    def cleanup_stale_drones(self, timeout=3):
+    def cleanup_stale_drones(self, timeout=STALE_DRONE_TIMEOUT):
         """Remove drones that haven't been seen for a while"""
         current_time = time.time()
-        stale_drones = []
+        fresh = {}
+        stale_drones = set()
         
         for drone_id, last_seen in self.last_activity.items():
             if current_time - last_seen > timeout:
-                stale_drones.append(drone_id)
+                stale_drones.add(drone_id)
+            else:
+                fresh[drone_id] = last_seen
+        
+        if not stale_drones:
+            return
         
-        for drone_id in stale_drones:
-            if hasattr(self.drone_network, 'known_drones') and drone_id in self.drone_network.known_drones:
-                del self.drone_network.known_drones[drone_id]
-            if drone_id in self.last_activity:
-                del self.last_activity[drone_id]
+        # Swap in rebuilt dicts rather than deleting in place, so the display
+        # thread can keep iterating the old ones safely. The lock keeps a
+        # concurrent master sync from writing to the dict being replaced.
+        self.last_activity = fresh
+        if hasattr(self.drone_network, 'known_drones'):
+            with self.drone_network.lock:
+                self.drone_network.known_drones = {
+                    drone_id: drone for drone_id, drone in self.drone_network.known_drones.items()
+                    if drone_id not in stale_drones
+                }
 
 class DroneNetworkVisualizer:
     """
@@ -380,6 +462,8 @@ class DroneNetworkVisualizer:
         self.monitor = monitor
         self.network = monitor.drone_network
         self.update_interval = 1.0  # Update every second
+        self._sorted_ids: List[int] = []  # Drone IDs in display order
+        self._sorted_ids_key: Optional[set] = None  # Membership they were sorted for
         
     def clear_screen(self):
         """Clear terminal screen"""
@@ -387,15 +471,7 @@ class DroneNetworkVisualizer:
     
     def get_status_symbol(self, status: DroneStatus) -> str:
         """Get visual symbol for drone status"""
-        symbols = {
-            DroneStatus.OFFLINE: "⚫",
-            DroneStatus.SEEKING: "🔍",
-            DroneStatus.CONNECTED: "🟢",
-            DroneStatus.MASTER: "👑",
-            DroneStatus.SLAVE: "🔵",
-            DroneStatus.LOST: "❌"
-        }
-        return symbols.get(status, "❓")
+        return _STATUS_SYMBOLS.get(status, "❓")
     
     def format_position(self, position: tuple) -> str:
         """Format position coordinates"""
@@ -439,14 +515,19 @@ class DroneNetworkVisualizer:
     
     def print_drone_table(self):
         """Print detailed drone information table"""
-        drones = self.network.get_all_drones()
+        drones = self.network.known_drones
         
         # Table header
         print(f"{'ID':>6} {'Status':>8} {'Position':>20} {'Battery':>10} {'Reliability':>12} {'Last Seen':>12}")
         print("-" * 80)
         
-        # Sort drones by ID for consistent display
-        sorted_drones = sorted(drones, key=lambda d: d.drone_id)
+        # Sort drones by ID for consistent display, re-sorting only when
+        # the set of known drones has changed since the last frame
+        drone_ids = drones.keys()
+        if drone_ids != self._sorted_ids_key:
+            self._sorted_ids_key = set(drone_ids)
+            self._sorted_ids = sorted(drone_ids)
+        sorted_drones = [drones[i] for i in self._sorted_ids if i in drones]
         
         for drone in sorted_drones:
             # Status with symbol
@@ -487,11 +568,14 @@ class DroneNetworkVisualizer:
             print("   No drones online")
             return
         
-        # Group drones by status
-        master_drones = [d for d in online_drones if d.status == DroneStatus.MASTER]
-        slave_drones = [d for d in online_drones if d.status == DroneStatus.SLAVE]
-        connected_drones = [d for d in online_drones if d.status == DroneStatus.CONNECTED]
-        seeking_drones = [d for d in online_drones if d.status == DroneStatus.SEEKING]
+        # Group drones by status in a single pass
+        groups = {status: [] for status in _STATUSES}
+        for drone in online_drones:
+            groups[drone.status].append(drone)
+        master_drones = groups[DroneStatus.MASTER]
+        slave_drones = groups[DroneStatus.SLAVE]
+        connected_drones = groups[DroneStatus.CONNECTED]
+        seeking_drones = groups[DroneStatus.SEEKING]
         
         # Display hierarchy
         if master_drones:
@@ -554,17 +638,20 @@ class DroneNetworkVisualizer:
             while True:
                 self.clear_screen()
                 
-                # Clean up stale drones periodically
-                self.monitor.cleanup_stale_drones()
-                
-                # Display visualization
-                self.print_network_overview()
-                self.print_drone_table()
-                self.print_network_topology()
-                self.print_statistics()
+                # Render the frame into a buffer so the terminal gets a single
+                # write per refresh instead of one per printed line
+                frame = io.StringIO()
+                with contextlib.redirect_stdout(frame):
+                    self.print_network_overview()
+                    self.print_drone_table()
+                    self.print_network_topology()
+                    self.print_statistics()
+                    
+                    print(f"\n⏱️  Last updated: {time.strftime('%H:%M:%S')}")
+                    print("Press Ctrl+C to exit")
                 
-                print(f"\n⏱️  Last updated: {time.strftime('%H:%M:%S')}")
-                print("Press Ctrl+C to exit")
+                sys.stdout.write(frame.getvalue())
+                sys.stdout.flush()
                 
                 time.sleep(self.update_interval)
                 
@@ -626,12 +713,7 @@ class SimpleDroneMonitor:
         
         drones_str = []
         for drone in self.network.get_online_drones():
-            status_symbol = {
-                DroneStatus.SEEKING: "🔍",
-                DroneStatus.CONNECTED: "🟢", 
-                DroneStatus.MASTER: "👑",
-                DroneStatus.SLAVE: "🔵"
-            }.get(drone.status, "❓")
+            status_symbol = _COMPACT_STATUS_SYMBOLS.get(drone.status, "❓")
             
             self_marker = "*" if drone.is_self else ""
             drones_str.append(f"{drone.drone_id}{status_symbol}{self_marker}")